@@ -14,7 +14,12 @@ Usage:
 """
 
 from __future__ import annotations
-from typing import Dict, Callable, List
+import functools
+import re
+import sys
+import threading
+import time
+from typing import Dict, Callable, List, Optional, Tuple
 
 # Keyword-based routing table
 # Base model choices per task keyword
@@ -60,37 +65,107 @@ ALTERNATE_MODEL_ALIASES: Dict[str, List[str]] = {
     "google-code": ["google-code-alt"],
 }
 
+# Seconds to skip a model after its client_factory call failed
+FAILURE_COOLDOWN_SECONDS = 30.0
 
-def pick_model(task_type: str) -> str:
-    """Choose a model based on task keywords.
 
-    Args:
-        task_type: short description of the task, e.g. "architecture design" or "code generation".
+class ModelUnavailableError(Exception):
+    """Raised by a client_factory when a model cannot be used (missing key, no credits)."""
 
-    Returns:
-        Model name string.
+
+# Exceptions from client_factory that justify trying the next model
+FALLBACK_EXCEPTIONS: Tuple[type, ...] = (ModelUnavailableError, ConnectionError, PermissionError, TimeoutError)
+
+# Provider SDK error classes (module, class) also treated as fallback-worthy once the SDK is loaded
+_PROVIDER_ERRORS: List[Tuple[str, str]] = [
+    ("openai", "OpenAIError"),
+    ("anthropic", "AnthropicError"),
+    ("httpx", "HTTPError"),
+    ("google.api_core.exceptions", "GoogleAPIError"),
+    ("google.auth.exceptions", "GoogleAuthError"),
+    ("google.genai.errors", "APIError"),
+]
+
+
+def _fallback_exceptions() -> Tuple[type, ...]:
+    """Return FALLBACK_EXCEPTIONS plus error classes of provider SDKs already imported.
+
+    Only sys.modules is consulted, so the router never pays SDK import cost; a client
+    that raised a provider error has necessarily loaded that SDK already.
     """
-    lowered = task_type.lower()
-    for keyword, model in MODEL_MAP.items():
-        if keyword in lowered:
-            return model
-    return DEFAULT_MODEL
+    exceptions: List[type] = list(FALLBACK_EXCEPTIONS)
+    for module_name, class_name in _PROVIDER_ERRORS:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        try:
+            exc_type = getattr(module, class_name, None)
+        except Exception:  # Partially initialized or broken SDK; skip it
+            continue
+        if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+            exceptions.append(exc_type)
+    return tuple(exceptions)
 
 
-def model_fallback_chain(task_type: str) -> List[str]:
-    """Return a priority-ordered list of model ids for this task."""
-    primary = pick_model(task_type)
+# Keywords selecting a priority family, checked in this order (first family wins)
+FAMILY_KEYWORDS: Dict[str, List[str]] = {
+    "orchestration": ["orchestration"],
+    "reasoning": ["design", "architecture", "reasoning", "plan", "blueprint"],
+    "code": ["code", "implement", "debug", "fix", "refactor"],
+}
 
-    # Pick a priority family if available; else fall back to just the primary
-    if "orchestration" in task_type.lower():
-        chain = MODEL_PRIORITIES.get("orchestration", [primary])
-    elif any(k in task_type.lower() for k in ["design", "architecture", "reasoning", "plan", "blueprint"]):
-        chain = MODEL_PRIORITIES.get("reasoning", [primary])
-    elif any(k in task_type.lower() for k in ["code", "implement", "debug", "fix", "refactor"]):
-        chain = MODEL_PRIORITIES.get("code", [primary])
-    else:
-        chain = [primary]
+# All routing keywords compiled into one pattern so a task string is scanned once.
+# The lookahead reports overlapping hits; each keyword carries its MODEL_MAP rank
+# and family id (1-based in FAMILY_KEYWORDS order, 0 = none) so both priorities
+# are resolved from the same pass.
+_MODEL_RANK: Dict[str, int] = {keyword: rank for rank, keyword in enumerate(MODEL_MAP)}
+_FAMILY_ID: Dict[str, int] = {
+    keyword: family_id
+    for family_id, keywords in enumerate(FAMILY_KEYWORDS.values(), start=1)
+    for keyword in keywords
+}
+
+
+def _keyword_tag(keyword: str) -> Tuple[Optional[int], int]:
+    """Best (MODEL_MAP rank, family id) over `keyword` and every keyword it contains.
+
+    The scan reports only the longest keyword at each offset, so keywords contained in
+    it (which occur wherever it does) have their priorities folded in here.
+    """
+    model_ranks = [rank for other, rank in _MODEL_RANK.items() if other in keyword]
+    family_ids = [family_id for other, family_id in _FAMILY_ID.items() if other in keyword]
+    return min(model_ranks, default=None), min(family_ids, default=0)
+
+
+_KEYWORD_TAGS: Dict[str, Tuple[Optional[int], int]] = {
+    keyword: _keyword_tag(keyword)
+    for keyword in sorted({**_MODEL_RANK, **_FAMILY_ID}, key=len, reverse=True)
+}
+_MODEL_KEYWORDS: List[str] = list(MODEL_MAP)
+# Longest-first, so a keyword is never shadowed by one of its own prefixes
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(re.escape(k) for k in _KEYWORD_TAGS) + "))")
 
+# Fallback memo shared by get_llm_with_fallback calls, scoped per client_factory:
+# (factory, model) -> monotonic time until which it is skipped, and
+# (factory, chain) -> last non-primary model that worked for that chain.
+# Both are capped at _MEMO_MAX_ENTRIES (oldest evicted) so per-call closures can't leak.
+_MEMO_MAX_ENTRIES = 256
+_FAILURE_CACHE: Dict[Tuple[Callable[[str], object], str], float] = {}
+_LAST_GOOD: Dict[Tuple[Callable[[str], object], Tuple[str, ...]], str] = {}
+_FALLBACK_LOCK = threading.Lock()
+_FAILED = object()  # Sentinel from _try_client; factories may legitimately return None
+
+
+def _memo_set(memo: Dict, key: object, value: object) -> None:
+    """Insert into a fallback memo as its newest entry, evicting the oldest beyond the cap."""
+    memo.pop(key, None)
+    memo[key] = value
+    while len(memo) > _MEMO_MAX_ENTRIES:
+        del memo[next(iter(memo))]
+
+
+def _expand_chain(chain: List[str]) -> Tuple[str, ...]:
+    """Expand aliases for each model in `chain` and deduplicate, preserving order."""
     # Expand aliases for each entry to support multiple API keys/providers
     expanded: List[str] = []
     for model in chain:
@@ -98,13 +173,69 @@ def model_fallback_chain(task_type: str) -> List[str]:
         expanded.extend(ALTERNATE_MODEL_ALIASES.get(model, []))
 
     # Deduplicate while preserving order
-    seen = set()
-    ordered = []
-    for m in expanded:
-        if m not in seen:
-            seen.add(m)
-            ordered.append(m)
-    return ordered
+    return tuple(dict.fromkeys(expanded))
+
+
+# Fully expanded chains, computed once: per family, and per bare primary model
+_EXPANDED_PRIORITIES: Dict[str, Tuple[str, ...]] = {
+    family: _expand_chain(chain) for family, chain in MODEL_PRIORITIES.items()
+}
+_SINGLE_EXPANDED: Dict[str, Tuple[str, ...]] = {
+    model: _expand_chain([model]) for model in {*MODEL_MAP.values(), DEFAULT_MODEL}
+}
+# Indexed by family id; None (no family, or no MODEL_PRIORITIES entry) defers to the primary
+_FAMILY_CHAINS: Tuple[Optional[Tuple[str, ...]], ...] = (None,) + tuple(
+    _EXPANDED_PRIORITIES.get(family) for family in FAMILY_KEYWORDS
+)
+
+
+def pick_model(task_type: str) -> str:
+    """Choose a model based on task keywords.
+
+    Args:
+        task_type: short description of the task, e.g. "architecture design" or "code generation".
+
+    Returns:
+        Model name string.
+    """
+    return _classify(task_type)[0]
+
+
+def _classify(task_type: str) -> Tuple[str, int]:
+    """Return (primary model, family id) from one keyword scan; family id 0 means none."""
+    model_rank: Optional[int] = None
+    family_id = 0
+    for match in _KEYWORD_PATTERN.finditer(task_type.lower()):
+        keyword_model, keyword_family = _KEYWORD_TAGS[match.group(1)]
+        if keyword_model is not None and (model_rank is None or keyword_model < model_rank):
+            model_rank = keyword_model
+        if keyword_family and (not family_id or keyword_family < family_id):
+            family_id = keyword_family
+        if model_rank == 0 and family_id == 1:
+            break
+
+    primary = MODEL_MAP[_MODEL_KEYWORDS[model_rank]] if model_rank is not None else DEFAULT_MODEL
+    return primary, family_id
+
+
+def model_fallback_chain(task_type: str) -> Tuple[str, ...]:
+    """Return a priority-ordered tuple of model ids for this task."""
+    return _compute_chain(_normalize_task(task_type))
+
+
+def _normalize_task(task_type: str) -> str:
+    """Lowercase and collapse whitespace so equivalent task strings share a cache entry."""
+    return " ".join(task_type.lower().split())
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_chain(normalized: str) -> Tuple[str, ...]:
+    """Build the fallback chain for a normalized task string (cached, immutable)."""
+    primary, family_id = _classify(normalized)
+
+    # Pick a priority family if available; else fall back to just the primary
+    chain = _FAMILY_CHAINS[family_id]
+    return chain if chain is not None else _SINGLE_EXPANDED[primary]
 
 
 def get_llm_with_fallback(
@@ -114,10 +245,16 @@ def get_llm_with_fallback(
     """
     Instantiate an LLM client with fallback across multiple providers/models.
 
+    Models whose client_factory call failed within FAILURE_COOLDOWN_SECONDS are tried
+    last, only if nothing else works. While the chain's primary is cooling down, the
+    model that last succeeded for the chain is tried first.
+
     Args:
         task_type: short description ("orchestration", "architecture design", "code generation", etc.)
         client_factory: function that takes model_name -> returns initialized client.
-                       It should raise on auth/credit errors so we can try next.
+                       It should raise ModelUnavailableError (or another of
+                       FALLBACK_EXCEPTIONS, or a provider SDK error) on auth/credit/network
+                       errors so we can try next; any other exception propagates.
 
     Returns:
         An initialized LLM client.
@@ -125,16 +262,66 @@ def get_llm_with_fallback(
     Raises:
         RuntimeError if all candidates fail.
     """
-    errors = []
-    for model_name in model_fallback_chain(task_type):
-        try:
-            return client_factory(model_name)
-        except Exception as exc:  # Broad by design to catch auth/credit failures
-            errors.append(f"{model_name}: {exc}")
+    chain = model_fallback_chain(task_type)
+    with _FALLBACK_LOCK:
+        primary_cooling = _FAILURE_CACHE.get((client_factory, chain[0]), 0.0) > time.monotonic()
+        last_good = _LAST_GOOD.get((client_factory, chain)) if primary_cooling else None
+    candidates = chain
+    if last_good is not None:
+        candidates = (last_good,) + tuple(m for m in chain if m != last_good)
+
+    errors: List[str] = []
+    cooling: List[str] = []
+    for model_name in candidates:
+        with _FALLBACK_LOCK:
+            skip_until = _FAILURE_CACHE.get((client_factory, model_name), 0.0)
+        if skip_until > time.monotonic():
+            cooling.append(model_name)
             continue
+        client = _try_client(client_factory, chain, model_name, errors)
+        if client is not _FAILED:
+            return client
+
+    # Nothing else worked: retry cooled-down models rather than fail without trying them
+    for model_name in cooling:
+        client = _try_client(client_factory, chain, model_name, errors)
+        if client is not _FAILED:
+            return client
     raise RuntimeError(f"All model fallbacks failed for task '{task_type}'. Errors: {errors}")
 
 
+def _try_client(
+    client_factory: Callable[[str], object],
+    chain: Tuple[str, ...],
+    model_name: str,
+    errors: List[str],
+) -> object:
+    """Call client_factory(model_name) and update the fallback memo.
+
+    Returns the client, or _FAILED (after recording the error) on a fallback-worthy exception.
+    """
+    try:
+        client = client_factory(model_name)
+    except _fallback_exceptions() as exc:  # Evaluated only when the factory raises
+        with _FALLBACK_LOCK:
+            now = time.monotonic()
+            for key in [key for key, until in _FAILURE_CACHE.items() if until <= now]:
+                del _FAILURE_CACHE[key]
+            _memo_set(_FAILURE_CACHE, (client_factory, model_name), now + FAILURE_COOLDOWN_SECONDS)
+            if _LAST_GOOD.get((client_factory, chain)) == model_name:
+                del _LAST_GOOD[(client_factory, chain)]
+        errors.append(f"{model_name}: {exc}")
+        return _FAILED
+    with _FALLBACK_LOCK:
+        _FAILURE_CACHE.pop((client_factory, model_name), None)
+        # Last-good is only consulted while chain[0] cools down, so a primary success clears it
+        if model_name == chain[0]:
+            _LAST_GOOD.pop((client_factory, chain), None)
+        else:
+            _memo_set(_LAST_GOOD, (client_factory, chain), model_name)
+    return client
+
+
 # OPTIONAL: Example integration stub (replace with your actual client calls)
 #
 # from langchain_openai import ChatOpenAI
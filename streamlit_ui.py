@@ -4,13 +4,19 @@ Provides interactive web interface for agent generation
 """
 
 import streamlit as st
+import copy
 import json
 import os
 from dotenv import load_dotenv
 from typing import Any
 
-# Load environment
-load_dotenv(override=True)
+# Load environment once per process; Streamlit reruns reuse the cached result
+@st.cache_resource(show_spinner=False)
+def _load_env() -> bool:
+    return load_dotenv(override=True)
+
+
+_load_env()
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -24,7 +30,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CUSTOM_CSS = """
 <style>
     .main {
         padding-top: 2rem;
@@ -59,20 +65,244 @@ st.markdown("""
         border-radius: 10px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Re-emitted every rerun: Streamlit drops elements a rerun doesn't produce, and
+# identical markdown is diffed away on the frontend.
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
-if "step" not in st.session_state:
-    st.session_state.step = 1
-    st.session_state.user_request = ""
-    st.session_state.strategies = None
-    st.session_state.selected_strategy = None
-    st.session_state.blueprint = None
-    st.session_state.generated_code = None
-    st.session_state.history = []
+_SESSION_DEFAULTS = {
+    "step": 1,
+    "user_request": "",
+    "strategies": None,
+    "selected_strategy": None,
+    "blueprint": None,
+    "blueprint_json": None,
+    "generated_code": None,
+    "generated_code_lines": 0,
+}
+
+for key, value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
+# Mutable default gets a fresh list per session
+st.session_state.setdefault("history", [])
+
+# ============================================================================
+# SIMULATED AGENT OUTPUTS
+# ============================================================================
+
+# Templates live at module scope so Streamlit reruns don't rebuild them; builders
+# hand out deep copies so session state never aliases the shared templates.
+_STRATEGIES_TEMPLATE = {
+    "strategy_a": {
+        "name": "Rule-Based Approach",
+        "description": "Uses predefined rules and patterns to handle support requests",
+        "pros": [
+            "Fast response time",
+            "Predictable behavior",
+            "Easy to debug",
+            "Good for known patterns"
+        ],
+        "cons": [
+            "Limited flexibility",
+            "Needs manual rule updates",
+            "Can't handle novel cases"
+        ],
+        "estimated_time": "2-3 hours",
+        "estimated_cost": "$150"
+    },
+    "strategy_b": {
+        "name": "ML-Based Approach",
+        "description": "Uses machine learning models to understand and respond to support requests",
+        "pros": [
+            "Learns from interactions",
+            "Handles novel cases",
+            "Improves over time",
+            "Better language understanding"
+        ],
+        "cons": [
+            "Requires training data",
+            "Slower initial setup",
+            "Harder to debug",
+            "May need fine-tuning"
+        ],
+        "estimated_time": "1-2 days",
+        "estimated_cost": "$500"
+    }
+}
+
+_BLUEPRINT_TEMPLATE = {
+    "agent_name": "CustomerSupportAgent",
+    "description": "",
+    "strategy": None,
+    "components": [
+        {
+            "name": "RequestAnalyzer",
+            "type": "NLP",
+            "purpose": "Analyze incoming support requests"
+        },
+        {
+            "name": "KnowledgeBaseLookup",
+            "type": "Tool",
+            "purpose": "Search knowledge base for answers"
+        },
+        {
+            "name": "TicketCreator",
+            "type": "Tool",
+            "purpose": "Create support tickets in system"
+        },
+        {
+            "name": "EmailNotifier",
+            "type": "Tool",
+            "purpose": "Send email responses"
+        }
+    ],
+    "tools_required": [
+        "knowledge_base_api",
+        "ticket_system_api",
+        "email_service"
+    ],
+    "estimated_setup_time": "2-3 hours",
+    "estimated_cost": "$150"
+}
+
+_GENERATED_CODE_TEMPLATE = '''"""
+Generated AI Agent - CustomerSupportAgent
+Created by Meta-Agent Factory
+"""
+
+from typing import Any, Optional
+import asyncio
+from langchain.agents import AgentExecutor, create_openai_tools_agent
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage
+from langchain.tools import Tool
+import json
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+class AgentConfig:
+    """Agent configuration"""
+    MODEL = "gpt-4o"
+    TEMPERATURE = 0.7
+    MAX_RETRIES = 3
+    TIMEOUT = 30
+
+# ============================================================================
+# TOOL DEFINITIONS
+# ============================================================================
+
+def search_knowledge_base(query: str) -> str:
+    """Search company knowledge base for answers"""
+    # Mock implementation - replace with real API
+    return f"Found answer for: {query}"
+
+def create_support_ticket(issue: str, priority: str) -> str:
+    """Create support ticket in system"""
+    # Mock implementation - replace with real API
+    return f"Ticket created: {issue[:30]}... (Priority: {priority})"
+
+def send_email(recipient: str, subject: str, body: str) -> str:
+    """Send email to customer"""
+    # Mock implementation - replace with real API
+    return f"Email sent to {recipient}"
+
+# ============================================================================
+# AGENT SETUP
+# ============================================================================
+
+tools = [
+    Tool(
+        name="SearchKnowledgeBase",
+        func=search_knowledge_base,
+        description="Search company knowledge base for answers to customer questions"
+    ),
+    Tool(
+        name="CreateTicket",
+        func=create_support_ticket,
+        description="Create a support ticket when issue needs escalation"
+    ),
+    Tool(
+        name="SendEmail",
+        func=send_email,
+        description="Send email response to customer"
+    )
+]
+
+class CustomerSupportAgent:
+    """Customer Support Agent"""
+    
+    def __init__(self):
+        self.llm = ChatOpenAI(
+            model=AgentConfig.MODEL,
+            temperature=AgentConfig.TEMPERATURE
+        )
+        self.agent = create_openai_tools_agent(self.llm, tools, prompt=None)
+        self.executor = AgentExecutor.from_agent_and_tools(
+            agent=self.agent,
+            tools=tools,
+            verbose=True
+        )
+    
+    async def handle_request(self, request: str) -> str:
+        """Process customer support request"""
+        try:
+            result = await self.executor.ainvoke({"input": request})
+            return result["output"]
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
+    
+    async def run(self):
+        """Run agent in interactive mode"""
+        print("🤖 Customer Support Agent Started")
+        print("Type 'exit' to quit")
+        print("-" * 50)
+        
+        while True:
+            user_input = input("Customer: ").strip()
+            
+            if user_input.lower() == "exit":
+                print("Goodbye!")
+                break
+            
+            if not user_input:
+                continue
+            
+            response = await self.handle_request(user_input)
+            print(f"Agent: {response}")
+            print("-" * 50)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    agent = CustomerSupportAgent()
+    asyncio.run(agent.run())
+'''
+
+
+def _build_strategies(user_request: str) -> dict:
+    """Simulate the consultant agent's strategy proposals for a request."""
+    return copy.deepcopy(_STRATEGIES_TEMPLATE)
+
+
+def _build_blueprint(user_request: str, strategy_id: str) -> dict:
+    """Simulate the architect agent's blueprint for the selected strategy."""
+    blueprint = copy.deepcopy(_BLUEPRINT_TEMPLATE)
+    blueprint.update(description=user_request, strategy=strategy_id)
+    return blueprint
+
+
+def _build_code(blueprint: dict) -> str:
+    """Simulate the coder agent's output for a blueprint."""
+    return _GENERATED_CODE_TEMPLATE
 
 # ============================================================================
 # MAIN UI
@@ -124,43 +354,7 @@ if generate_btn and user_request:
     st.session_state.step = 2
     
     # Simulate consultant agent response
-    st.session_state.strategies = {
-        "strategy_a": {
-            "name": "Rule-Based Approach",
-            "description": "Uses predefined rules and patterns to handle support requests",
-            "pros": [
-                "Fast response time",
-                "Predictable behavior",
-                "Easy to debug",
-                "Good for known patterns"
-            ],
-            "cons": [
-                "Limited flexibility",
-                "Needs manual rule updates",
-                "Can't handle novel cases"
-            ],
-            "estimated_time": "2-3 hours",
-            "estimated_cost": "$150"
-        },
-        "strategy_b": {
-            "name": "ML-Based Approach",
-            "description": "Uses machine learning models to understand and respond to support requests",
-            "pros": [
-                "Learns from interactions",
-                "Handles novel cases",
-                "Improves over time",
-                "Better language understanding"
-            ],
-            "cons": [
-                "Requires training data",
-                "Slower initial setup",
-                "Harder to debug",
-                "May need fine-tuning"
-            ],
-            "estimated_time": "1-2 days",
-            "estimated_cost": "$500"
-        }
-    }
+    st.session_state.strategies = _build_strategies(user_request)
     
     st.success("✨ Strategies generated!")
     st.rerun()
@@ -182,14 +376,10 @@ if st.session_state.step >= 2 and st.session_state.strategies:
         
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown("**Pros:**")
-            for pro in strategy_a["pros"]:
-                st.markdown(f"✅ {pro}")
+            st.markdown("**Pros:**\n\n" + "\n\n".join(f"✅ {pro}" for pro in strategy_a["pros"]))
         
         with col2:
-            st.markdown("**Cons:**")
-            for con in strategy_a["cons"]:
-                st.markdown(f"⚠️ {con}")
+            st.markdown("**Cons:**\n\n" + "\n\n".join(f"⚠️ {con}" for con in strategy_a["cons"]))
         
         st.markdown(f"**Estimated Time:** {strategy_a['estimated_time']}")
         st.markdown(f"**Estimated Cost:** {strategy_a['estimated_cost']}")
@@ -205,14 +395,10 @@ if st.session_state.step >= 2 and st.session_state.strategies:
         
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown("**Pros:**")
-            for pro in strategy_b["pros"]:
-                st.markdown(f"✅ {pro}")
+            st.markdown("**Pros:**\n\n" + "\n\n".join(f"✅ {pro}" for pro in strategy_b["pros"]))
         
         with col2:
-            st.markdown("**Cons:**")
-            for con in strategy_b["cons"]:
-                st.markdown(f"⚠️ {con}")
+            st.markdown("**Cons:**\n\n" + "\n\n".join(f"⚠️ {con}" for con in strategy_b["cons"]))
         
         st.markdown(f"**Estimated Time:** {strategy_b['estimated_time']}")
         st.markdown(f"**Estimated Cost:** {strategy_b['estimated_cost']}")
@@ -233,55 +419,25 @@ if st.session_state.step >= 3 and st.session_state.selected_strategy:
     
     if st.session_state.blueprint is None:
         # Generate blueprint (simulated)
-        st.session_state.blueprint = {
-            "agent_name": "CustomerSupportAgent",
-            "description": st.session_state.user_request,
-            "strategy": st.session_state.selected_strategy,
-            "components": [
-                {
-                    "name": "RequestAnalyzer",
-                    "type": "NLP",
-                    "purpose": "Analyze incoming support requests"
-                },
-                {
-                    "name": "KnowledgeBaseLookup",
-                    "type": "Tool",
-                    "purpose": "Search knowledge base for answers"
-                },
-                {
-                    "name": "TicketCreator",
-                    "type": "Tool",
-                    "purpose": "Create support tickets in system"
-                },
-                {
-                    "name": "EmailNotifier",
-                    "type": "Tool",
-                    "purpose": "Send email responses"
-                }
-            ],
-            "tools_required": [
-                "knowledge_base_api",
-                "ticket_system_api",
-                "email_service"
-            ],
-            "estimated_setup_time": "2-3 hours",
-            "estimated_cost": "$150"
-        }
+        st.session_state.blueprint = _build_blueprint(
+            st.session_state.user_request,
+            st.session_state.selected_strategy,
+        )
+        # Serialized once; st.json renders the string without re-encoding it on reruns
+        st.session_state.blueprint_json = json.dumps(st.session_state.blueprint, indent=2)
     
     # Display blueprint
     col1, col2 = st.columns([0.6, 0.4])
     
     with col1:
         st.markdown("**Blueprint Overview:**")
-        st.json(st.session_state.blueprint)
+        st.json(st.session_state.blueprint_json)
     
     with col2:
         st.markdown("**System Components:**")
         for comp in st.session_state.blueprint["components"]:
             with st.container(border=True):
-                st.markdown(f"**{comp['name']}**")
-                st.markdown(f"*{comp['type']}*")
-                st.markdown(f"{comp['purpose']}")
+                st.markdown(f"**{comp['name']}**\n\n*{comp['type']}*\n\n{comp['purpose']}")
     
     st.markdown("---")
     
@@ -317,122 +473,8 @@ if st.session_state.step >= 4 and st.session_state.blueprint:
     
     if st.session_state.generated_code is None:
         # Generate code (simulated)
-        st.session_state.generated_code = '''"""
-Generated AI Agent - CustomerSupportAgent
-Created by Meta-Agent Factory
-"""
-
-from typing import Any, Optional
-import asyncio
-from langchain.agents import AgentExecutor, create_openai_tools_agent
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
-from langchain.tools import Tool
-import json
-
-# ============================================================================
-# CONFIGURATION
-# ============================================================================
-
-class AgentConfig:
-    """Agent configuration"""
-    MODEL = "gpt-4o"
-    TEMPERATURE = 0.7
-    MAX_RETRIES = 3
-    TIMEOUT = 30
-
-# ============================================================================
-# TOOL DEFINITIONS
-# ============================================================================
-
-def search_knowledge_base(query: str) -> str:
-    """Search company knowledge base for answers"""
-    # Mock implementation - replace with real API
-    return f"Found answer for: {query}"
-
-def create_support_ticket(issue: str, priority: str) -> str:
-    """Create support ticket in system"""
-    # Mock implementation - replace with real API
-    return f"Ticket created: {issue[:30]}... (Priority: {priority})"
-
-def send_email(recipient: str, subject: str, body: str) -> str:
-    """Send email to customer"""
-    # Mock implementation - replace with real API
-    return f"Email sent to {recipient}"
-
-# ============================================================================
-# AGENT SETUP
-# ============================================================================
-
-tools = [
-    Tool(
-        name="SearchKnowledgeBase",
-        func=search_knowledge_base,
-        description="Search company knowledge base for answers to customer questions"
-    ),
-    Tool(
-        name="CreateTicket",
-        func=create_support_ticket,
-        description="Create a support ticket when issue needs escalation"
-    ),
-    Tool(
-        name="SendEmail",
-        func=send_email,
-        description="Send email response to customer"
-    )
-]
-
-class CustomerSupportAgent:
-    """Customer Support Agent"""
-    
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model=AgentConfig.MODEL,
-            temperature=AgentConfig.TEMPERATURE
-        )
-        self.agent = create_openai_tools_agent(self.llm, tools, prompt=None)
-        self.executor = AgentExecutor.from_agent_and_tools(
-            agent=self.agent,
-            tools=tools,
-            verbose=True
-        )
-    
-    async def handle_request(self, request: str) -> str:
-        """Process customer support request"""
-        try:
-            result = await self.executor.ainvoke({"input": request})
-            return result["output"]
-        except Exception as e:
-            return f"Error processing request: {str(e)}"
-    
-    async def run(self):
-        """Run agent in interactive mode"""
-        print("🤖 Customer Support Agent Started")
-        print("Type 'exit' to quit")
-        print("-" * 50)
-        
-        while True:
-            user_input = input("Customer: ").strip()
-            
-            if user_input.lower() == "exit":
-                print("Goodbye!")
-                break
-            
-            if not user_input:
-                continue
-            
-            response = await self.handle_request(user_input)
-            print(f"Agent: {response}")
-            print("-" * 50)
-
-# ============================================================================
-# MAIN EXECUTION
-# ============================================================================
-
-if __name__ == "__main__":
-    agent = CustomerSupportAgent()
-    asyncio.run(agent.run())
-'''
+        st.session_state.generated_code = _build_code(st.session_state.blueprint)
+        st.session_state.generated_code_lines = st.session_state.generated_code.count("\n") + 1
     
     # Code display
     st.code(st.session_state.generated_code, language="python")
@@ -481,8 +523,9 @@ if __name__ == "__main__":
     
     with col1:
         with st.container(border=True):
-            st.markdown("**1️⃣ Setup**")
             st.markdown("""
+            **1️⃣ Setup**
+
             - Install dependencies
             - Configure API keys
             - Set up data sources
@@ -490,8 +533,9 @@ if __name__ == "__main__":
     
     with col2:
         with st.container(border=True):
-            st.markdown("**2️⃣ Customize**")
             st.markdown("""
+            **2️⃣ Customize**
+
             - Adjust parameters
             - Add custom tools
             - Fine-tune responses
@@ -499,8 +543,9 @@ if __name__ == "__main__":
     
     with col3:
         with st.container(border=True):
-            st.markdown("**3️⃣ Deploy**")
             st.markdown("""
+            **3️⃣ Deploy**
+
             - Test thoroughly
             - Deploy to production
             - Monitor performance
@@ -519,7 +564,7 @@ with st.sidebar:
         st.metric("Request Length", len(st.session_state.user_request))
     
     if st.session_state.generated_code:
-        st.metric("Code Lines", len(st.session_state.generated_code.split('\n')))
+        st.metric("Code Lines", st.session_state.generated_code_lines)
     
     st.divider()
     
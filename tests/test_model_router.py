@@ -0,0 +1,159 @@
+"""Tests for src.model_router: keyword routing and the get_llm_with_fallback memo."""
+
+import unittest
+from unittest import mock
+
+from src import model_router
+from src.model_router import (
+    DEFAULT_MODEL,
+    ModelUnavailableError,
+    get_llm_with_fallback,
+    model_fallback_chain,
+    pick_model,
+)
+
+REASONING_CHAIN = (
+    "google-pro-reasoning", "google-pro-reasoning-alt",
+    "sonar-reasoning", "sonar-reasoning-alt",
+    "sonar", "sonar-alt-1", "sonar-alt-2",
+)
+CODE_CHAIN = (
+    "google-code", "google-code-alt",
+    "claude-3.5-sonnet",
+    "sonar-reasoning", "sonar-reasoning-alt",
+)
+ORCHESTRATION_CHAIN = (
+    "google-fast", "google-fast-alt",
+    "sonar", "sonar-alt-1", "sonar-alt-2",
+    "sonar-reasoning", "sonar-reasoning-alt",
+)
+
+
+class RoutingTest(unittest.TestCase):
+    def test_pick_model(self):
+        cases = [
+            ("architecture design", "sonar-reasoning"),
+            ("code generation", "claude-3.5-sonnet"),
+            # Lower MODEL_MAP index wins regardless of position in the text
+            ("architecture code", "sonar-reasoning"),
+            ("fix the plan", "sonar-reasoning"),
+            ("refactor then summary", "sonar"),
+            ("ORCHESTRATION", "sonar"),
+            ("prefix", "claude-3.5-sonnet"),  # substring match, like the baseline
+            ("write a poem", DEFAULT_MODEL),
+            ("", DEFAULT_MODEL),
+        ]
+        for task_type, expected in cases:
+            with self.subTest(task_type=task_type):
+                self.assertEqual(pick_model(task_type), expected)
+
+    def test_model_fallback_chain(self):
+        cases = [
+            # Orchestration family beats reasoning, which beats code
+            ("orchestration of code design", ORCHESTRATION_CHAIN),
+            ("debug the architecture", REASONING_CHAIN),
+            ("implement and refactor", CODE_CHAIN),
+            # Family comes from FAMILY_KEYWORDS even when pick_model prefers another model
+            ("chat about code", CODE_CHAIN),
+            # No family: the primary model expanded with its aliases
+            ("chat", ("sonar", "sonar-alt-1", "sonar-alt-2")),
+            ("handoff", model_router._SINGLE_EXPANDED["sonar"]),
+            ("write a poem", model_router._SINGLE_EXPANDED[DEFAULT_MODEL]),
+        ]
+        for task_type, expected in cases:
+            with self.subTest(task_type=task_type):
+                self.assertEqual(model_fallback_chain(task_type), expected)
+
+    def test_case_and_whitespace_variants_share_cache_entry(self):
+        model_router._compute_chain.cache_clear()
+        variants = ["Architecture  Design", "architecture design", "  ARCHITECTURE\tdesign\n"]
+        chains = [model_fallback_chain(task_type) for task_type in variants]
+
+        self.assertTrue(all(chain is chains[0] for chain in chains))
+        info = model_router._compute_chain.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+
+class FakeFactory:
+    """client_factory stub that fails for models in `down` and records every call."""
+
+    def __init__(self, down=()):
+        self.down = set(down)
+        self.calls = []
+
+    def __call__(self, model_name):
+        self.calls.append(model_name)
+        if model_name in self.down:
+            raise ModelUnavailableError(f"{model_name} unavailable")
+        return model_name
+
+
+class GetLlmWithFallbackTest(unittest.TestCase):
+    def setUp(self):
+        model_router._FAILURE_CACHE.clear()
+        model_router._LAST_GOOD.clear()
+
+    def test_falls_back_on_model_unavailable(self):
+        factory = FakeFactory(down={"google-pro-reasoning", "google-pro-reasoning-alt"})
+        self.assertEqual(get_llm_with_fallback("architecture", factory), "sonar-reasoning")
+
+    def test_other_exceptions_propagate(self):
+        def factory(model_name):
+            raise TypeError("bug in factory")
+
+        with self.assertRaises(TypeError):
+            get_llm_with_fallback("debug", factory)
+
+    def test_cooled_down_models_are_retried_before_raising(self):
+        chain = model_router.model_fallback_chain("debug")
+        factory = FakeFactory(down=chain)
+        with self.assertRaises(RuntimeError):
+            get_llm_with_fallback("debug", factory)
+
+        # Provider recovers: every model is cooling down but still gets tried
+        factory.down.clear()
+        factory.calls.clear()
+        self.assertEqual(get_llm_with_fallback("debug", factory), chain[0])
+        self.assertEqual(factory.calls, [chain[0]])
+
+    def test_last_good_promoted_while_primary_cools(self):
+        factory = FakeFactory(down={"google-code", "google-code-alt", "claude-3.5-sonnet"})
+        self.assertEqual(get_llm_with_fallback("fix", factory), "sonar-reasoning")
+
+        factory.calls.clear()
+        self.assertEqual(get_llm_with_fallback("fix", factory), "sonar-reasoning")
+        self.assertEqual(factory.calls, ["sonar-reasoning"])
+
+    def test_primary_preferred_again_after_cooldown(self):
+        factory = FakeFactory(down={"google-code"})
+        with mock.patch.object(model_router, "FAILURE_COOLDOWN_SECONDS", 0.0):
+            self.assertEqual(get_llm_with_fallback("code", factory), "google-code-alt")
+
+        factory.down.clear()
+        factory.calls.clear()
+        self.assertEqual(get_llm_with_fallback("code", factory), "google-code")
+        self.assertEqual(factory.calls, ["google-code"])
+
+    def test_failures_are_scoped_per_factory(self):
+        broken = FakeFactory(down={"sonar"})
+        self.assertEqual(get_llm_with_fallback("chat", broken), "sonar-alt-1")
+
+        healthy = FakeFactory()
+        self.assertEqual(get_llm_with_fallback("chat", healthy), "sonar")
+        self.assertEqual(healthy.calls, ["sonar"])
+
+    def test_primary_success_records_no_last_good(self):
+        for _ in range(1000):
+            self.assertEqual(get_llm_with_fallback("code", lambda model_name: model_name), "google-code")
+        self.assertEqual(len(model_router._LAST_GOOD), 0)
+
+    def test_memo_is_bounded_for_per_call_factories(self):
+        with mock.patch.object(model_router, "_MEMO_MAX_ENTRIES", 8):
+            for _ in range(100):
+                self.assertEqual(get_llm_with_fallback("code", FakeFactory(down={"google-code"})), "google-code-alt")
+            self.assertLessEqual(len(model_router._FAILURE_CACHE), 8)
+            self.assertLessEqual(len(model_router._LAST_GOOD), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()